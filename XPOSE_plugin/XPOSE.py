@@ -16,6 +16,8 @@ from socket import gethostname
 from importlib import import_module
 import Keck
 
+from XPOSE_plugin.instrument_io import AsyncInstrument
+
 class XPOSE(GingaPlugin.LocalPlugin):
 
     def __init__(self, fv, fitsimage):
@@ -65,6 +67,18 @@ class XPOSE(GingaPlugin.LocalPlugin):
         self.settings.setDefaults()
         self.settings.load(onError='silent')
 
+        # Instrument I/O loop.  Created by start() and shut down by stop(),
+        # or by sequence_done() if a sequence was running at stop().
+        self.IO = None
+        # Future for the observation sequence in progress, if any.  Kept
+        # while the plugin is closed so that a reopened panel cannot start
+        # a second sequence.
+        self.sequence = None
+        # True between start() and stop(), while the GUI exists
+        self.active = False
+        # True while update_show() sets combobox indexes
+        self.updating = False
+
 
         self.instructions = {
             True: 'For visible light instruments, you can configure the '\
@@ -167,44 +181,27 @@ class XPOSE(GingaPlugin.LocalPlugin):
         w_show, b_show = Widgets.build_info(captions, orientation=orientation)
         self.w.update(b_show)
 
-        b_show.object.set_text(f'{self.INSTR.object}')
-        b_show.set_object.set_text(f'{self.INSTR.object}')
+        # Current values are filled in asynchronously by refresh()
         b_show.set_object.add_callback('activated', self.cb_set_object)
         b_show.set_object.set_tooltip("Set object name for header")
 
-        b_show.basename.set_text(f'{self.INSTR.basename}')
-        b_show.frameno.set_text(f'{self.INSTR.frameno:d}')
-        b_show.filename.set_text(f'{self.INSTR.get_filename()}')
-
-        b_show.itime.set_text(f'{self.INSTR.itime:<.1f}')
-        b_show.set_itime.set_text(f'{self.INSTR.itime:.2f}')
         b_show.set_itime.add_callback('activated', self.cb_set_itime)
         b_show.set_itime.set_tooltip("Set exposure time (s)")
 
         if self.INSTR.optical is True:
-            b_show.binning.set_text(f'{self.INSTR.binning_as_str()}')
             combobox = b_show.set_binning
             for binopt in self.INSTR.binnings:
                 combobox.append_text(binopt)
-            b_show.set_binning.set_index(self.INSTR.binnings.index(
-                                         self.INSTR.binning_as_str()))
             b_show.set_binning.add_callback('activated', self.cb_set_binning)
 
-            b_show.obstype.set_text(f'{self.INSTR.get_obstype()}')
             combobox = b_show.set_obstype
             for type in self.INSTR.obstypes:
                 combobox.append_text(type)
-            b_show.set_obstype.set_index(self.INSTR.obstypes.index(
-                                         self.INSTR.get_obstype()))
             b_show.set_obstype.add_callback('activated', self.cb_set_obstype)
 
         if self.INSTR.optical is False:
-            b_show.coadds.set_text(f'{self.INSTR.coadds:d}')
-            b_show.set_coadds.set_text(f'{self.INSTR.coadds:d}')
             b_show.set_coadds.add_callback('activated', self.cb_set_coadds)
             b_show.set_coadds.set_tooltip("Set number of Coadds")
-            b_show.sampmode.set_text('{:d} ({})'.format(self.INSTR.sampmode,
-                            self.INSTR.sampmode_trans[self.INSTR.sampmode]))
 
         fr_show.set_widget(w_show)
         vbox.add_widget(fr_show, stretch=0)
@@ -221,11 +218,13 @@ class XPOSE(GingaPlugin.LocalPlugin):
             btn_set_bright.add_callback('activated',
                                         lambda w: self.cb_set_bright(w))
             btns_params.add_widget(btn_set_bright, stretch=0)
+            self.w.set_bright = btn_set_bright
 
             btn_set_faint = Widgets.Button("Set Faint Object")
             btn_set_faint.add_callback('activated',
                                        lambda w: self.cb_set_faint(w))
             btns_params.add_widget(btn_set_faint, stretch=0)
+            self.w.set_faint = btn_set_faint
 
             vbox.add_widget(btns_params, stretch=0)
 
@@ -269,12 +268,8 @@ class XPOSE(GingaPlugin.LocalPlugin):
         combobox = b_script.obsseq
         for script in self.INSTR.scripts:
             combobox.append_text(script)
-        b_script.obsseq.set_index(self.INSTR.scripts.index(self.INSTR.script))
         b_script.obsseq.add_callback('activated', self.cb_set_script)
-        b_script.sequence.set_text(f'{self.INSTR.script}')
 
-        b_script.nrepeats.set_text(f'{self.INSTR.repeats:d}')
-        b_script.set_repeats.set_text(f'{self.INSTR.repeats:d}')
         b_script.set_repeats.add_callback('activated', self.cb_set_repeats)
         b_script.set_repeats.set_tooltip("Set number of repeats")
 
@@ -289,8 +284,9 @@ class XPOSE(GingaPlugin.LocalPlugin):
 
         btn_start_sequence = Widgets.Button(f"Start Observation Sequence")
         btn_start_sequence.add_callback('activated',
-                                        lambda w: self.INSTR.start_sequence())
+                                        lambda w: self.cb_start_sequence(w))
         btns_seq.add_widget(btn_start_sequence, stretch=0)
+        self.w.start_sequence = btn_start_sequence
 
         vbox.add_widget(btns_seq, stretch=0)
 
@@ -299,12 +295,14 @@ class XPOSE(GingaPlugin.LocalPlugin):
 
         btn_abort_immediately = Widgets.Button("Abort Immediately")
         btn_abort_immediately.add_callback('activated',
-                                  lambda w: self.INSTR.abort_immediately())
+                                  lambda w: self.instr_do(
+                                      self.IO.call_now('abort_immediately')))
         btns_abortseq.add_widget(btn_abort_immediately, stretch=0)
 
         btn_abort_afterframe = Widgets.Button("Abort After Frame")
         btn_abort_afterframe.add_callback('activated',
-                                 lambda w: self.INSTR.abort_afterframe())
+                                 lambda w: self.instr_do(
+                                     self.IO.call_now('abort_afterframe')))
         btns_abortseq.add_widget(btn_abort_afterframe, stretch=0)
 
 #         btn_abort_afterrepeat = Widgets.Button("Abort After Repeat")
@@ -426,6 +424,12 @@ class XPOSE(GingaPlugin.LocalPlugin):
         in many cases.
         """
         self.tw_inst.set_text(self.instructions[self.INSTR.optical])
+        self.active = True
+        if self.IO is None:
+            self.IO = AsyncInstrument(self.INSTR)
+        if self.sequence is not None:
+            # sequence_done() is still attached and will re-enable these
+            self.set_controls_enabled(False)
         self.resume()
 
     def pause(self):
@@ -449,7 +453,9 @@ class XPOSE(GingaPlugin.LocalPlugin):
         defocused.  The method may be omitted if there is no user event
         handling to enable.
         """
-        pass
+        # Reads would queue behind the sequence; sequence_done() refreshes
+        if self.sequence is None:
+            self.refresh()
 
     def stop(self):
         """
@@ -461,7 +467,13 @@ class XPOSE(GingaPlugin.LocalPlugin):
         closed for modal operations, and may be omitted if there is no
         special cleanup required when stopping.
         """
-        pass
+        self.active = False
+        if self.sequence is not None:
+            print(f'{self.INSTR.name} observation sequence still running, '
+                  f'instrument I/O will shut down when it completes')
+            return
+        self.IO.stop()
+        self.IO = None
 
     def redo(self):
         """
@@ -482,64 +494,183 @@ class XPOSE(GingaPlugin.LocalPlugin):
 
 
 
+    ## ------------------------------------------------------------------
+    ##  Instrument I/O
+    ## ------------------------------------------------------------------
+    def instr_do(self, coro, callback=None):
+        """
+        Run ``coro`` on the instrument I/O loop without blocking the GUI.
+        If given, ``callback`` is called on the GUI thread with the result.
+        """
+        if callback is None:
+            return self.IO.submit(coro)
+        return self.IO.submit(coro,
+                              lambda result: self.fv.gui_do(callback, result))
+
+
+    def refresh(self):
+        """
+        Read all of the displayed instrument values concurrently and update
+        the panel when they arrive.
+        """
+        names = ['object', 'basename', 'frameno', 'get_filename', 'itime',
+                 'script', 'repeats']
+        if self.INSTR.optical is True:
+            names.extend(['binning_as_str', 'get_obstype'])
+        else:
+            names.extend(['coadds', 'sampmode'])
+        self.instr_do(self.IO.get_many(names), self.update_show)
+
+
+    def set_controls_enabled(self, tf):
+        """
+        Enable or disable the sequence start button and every control which
+        changes an instrument parameter.
+        """
+        names = ['start_sequence', 'set_object', 'set_itime', 'obsseq',
+                 'set_repeats']
+        if self.INSTR.optical is True:
+            names.extend(['set_binning', 'set_obstype'])
+        else:
+            names.extend(['set_coadds', 'set_bright', 'set_faint'])
+        for name in names:
+            self.w[name].set_enabled(tf)
+
+
+    def update_show(self, values):
+        """
+        Update the panel widgets from a dict of instrument values as
+        returned by ``AsyncInstrument.get_many``.  Only the widgets for
+        the keys present in ``values`` are updated.
+        """
+        if 'object' in values:
+            self.w.object.set_text(f'{values["object"]}')
+            self.w.set_object.set_text(f'{values["object"]}')
+        if 'basename' in values:
+            self.w.basename.set_text(f'{values["basename"]}')
+        if 'frameno' in values:
+            self.w.frameno.set_text(f'{values["frameno"]:d}')
+        if 'get_filename' in values:
+            self.w.filename.set_text(f'{values["get_filename"]}')
+        if 'itime' in values:
+            self.w.itime.set_text(f'{values["itime"]:.2f}')
+            self.w.set_itime.set_text(f'{values["itime"]:.2f}')
+        if 'coadds' in values:
+            self.w.coadds.set_text(f'{values["coadds"]:d}')
+            self.w.set_coadds.set_text(f'{values["coadds"]:d}')
+        if 'sampmode' in values:
+            sampmode = values['sampmode']
+            self.w.sampmode.set_text('{:d} ({})'.format(sampmode,
+                                     self.INSTR.sampmode_trans[sampmode]))
+        if 'repeats' in values:
+            self.w.nrepeats.set_text(f'{values["repeats"]:d}')
+            self.w.set_repeats.set_text(f'{values["repeats"]:d}')
+
+        # Some widget sets fire 'activated' when the index is set from code
+        self.updating = True
+        try:
+            if 'binning_as_str' in values:
+                self.w.binning.set_text(f'{values["binning_as_str"]}')
+                index = self.INSTR.binnings.index(values['binning_as_str'])
+                self.w.set_binning.set_index(index)
+            if 'get_obstype' in values:
+                self.w.obstype.set_text(f'{values["get_obstype"]}')
+                index = self.INSTR.obstypes.index(values['get_obstype'])
+                self.w.set_obstype.set_index(index)
+            if 'script' in values:
+                self.w.sequence.set_text(f'{values["script"]}')
+                index = self.INSTR.scripts.index(values['script'])
+                self.w.obsseq.set_index(index)
+        finally:
+            self.updating = False
+
+
     ## ------------------------------------------------------------------
     ##  Button Callbacks
     ## ------------------------------------------------------------------
+    def cb_start_sequence(self, w):
+        if self.sequence is not None:
+            return
+        self.set_controls_enabled(False)
+        self.sequence = self.instr_do(self.IO.call('start_sequence'))
+        self.sequence.add_done_callback(
+                 lambda f: self.fv.gui_do(self.sequence_done))
+
+
+    def sequence_done(self):
+        self.sequence = None
+        if self.active is False:
+            # The plugin was closed while the sequence ran
+            self.IO.stop()
+            self.IO = None
+            return
+        self.set_controls_enabled(True)
+        self.refresh()
+
+
     def cb_set_object(self, w):
         object = str(w.get_text())
-        self.INSTR.set_object(object)
-        self.w.object.set_text(f'{object}')
+        self.instr_do(self.IO.call_and_get('set_object', object,
+                                           names=['object']),
+                      self.update_show)
 
 
     def cb_set_itime(self, w):
         itime = float(w.get_text())
-        self.INSTR.set_itime(itime)
-        self.w.itime.set_text(f'{itime:.2f}')
+        self.instr_do(self.IO.call_and_get('set_itime', itime,
+                                           names=['itime']),
+                      self.update_show)
 
 
     def cb_set_binning(self, w, index):
-        self.INSTR.set_binning(self.INSTR.binnings[index])
-        self.w.binning.set_text(self.INSTR.binning_as_str())
+        if self.updating is True:
+            return
+        self.instr_do(self.IO.call_and_get('set_binning',
+                                           self.INSTR.binnings[index],
+                                           names=['binning_as_str']),
+                      self.update_show)
 
 
     def cb_set_obstype(self, w, index):
-        self.INSTR.set_obstype(self.INSTR.obstypes[index])
-        self.w.obstype.set_text(f'{self.INSTR.get_obstype()}')
+        if self.updating is True:
+            return
+        self.instr_do(self.IO.call_and_get('set_obstype',
+                                           self.INSTR.obstypes[index],
+                                           names=['get_obstype']),
+                      self.update_show)
 
 
     def cb_set_coadds(self, w):
         coadds = int(w.get_text())
-        self.INSTR.set_coadds(coadds)
-        self.w.coadds.set_text(f'{self.INSTR.coadds:d}')
+        self.instr_do(self.IO.call_and_get('set_coadds', coadds,
+                                           names=['coadds']),
+                      self.update_show)
 
 
     def cb_set_bright(self, w):
-        self.INSTR.set_bright()
-        self.w.itime.set_text(f'{self.INSTR.itime:.2f}')
-        self.w.set_itime.set_text(f'{self.INSTR.itime:.2f}')
-        self.w.coadds.set_text(f'{self.INSTR.coadds:d}')
-        self.w.set_coadds.set_text(f'{self.INSTR.coadds:d}')
-        self.w.sampmode.set_text('{:d} ({})'.format(self.INSTR.sampmode,
-                            self.INSTR.sampmode_trans[self.INSTR.sampmode]))
+        self.instr_do(self.IO.call_and_get('set_bright',
+                                   names=['itime', 'coadds', 'sampmode']),
+                      self.update_show)
 
 
     def cb_set_faint(self, w):
-        self.INSTR.set_faint()
-        self.w.itime.set_text(f'{self.INSTR.itime:.2f}')
-        self.w.set_itime.set_text(f'{self.INSTR.itime:.2f}')
-        self.w.coadds.set_text(f'{self.INSTR.coadds:d}')
-        self.w.set_coadds.set_text(f'{self.INSTR.coadds:d}')
-        self.w.sampmode.set_text('{:d} ({})'.format(self.INSTR.sampmode,
-                            self.INSTR.sampmode_trans[self.INSTR.sampmode]))
+        self.instr_do(self.IO.call_and_get('set_faint',
+                                   names=['itime', 'coadds', 'sampmode']),
+                      self.update_show)
 
 
     def cb_set_repeats(self, w):
         nrepeats = int(w.get_text())
-        self.INSTR.set_repeats(nrepeats)
-        self.w.nrepeats.set_text(f'{self.INSTR.repeats:d}')
+        self.instr_do(self.IO.call_and_get('set_repeats', nrepeats,
+                                           names=['repeats']),
+                      self.update_show)
 
 
     def cb_set_script(self, w, index):
-        self.INSTR.script = self.INSTR.scripts[index]
-        self.w.sequence.set_text(f'{self.INSTR.script}')
+        if self.updating is True:
+            return
+        self.instr_do(self.IO.assign_and_get('script',
+                                             self.INSTR.scripts[index],
+                                             names=['script']),
+                      self.update_show)
 
@@ -0,0 +1,188 @@
+"""
+Asyncio based I/O layer for instrument keyword access.
+
+The Keck instrument classes read and write keywords with blocking calls.
+``AsyncInstrument`` wraps an instrument instance and issues those calls from
+an asyncio event loop running in its own thread, so the caller (usually the
+GUI thread) is never blocked and independent keywords can be read
+concurrently rather than one after another.
+
+Operations run one at a time, in the order they were submitted, so that a
+write is never overtaken by a later write or by a read that was submitted
+before it.  Only the reads within a single ``get_many`` fan out.
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AsyncInstrument(object):
+
+    def __init__(self, instrument, max_workers=8):
+        """
+        ``instrument`` is an instance of one of the ``Keck`` instrument
+        classes.  ``max_workers`` limits how many blocking keyword calls
+        may be in flight at once.
+        """
+        self.INSTR = instrument
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.loop = asyncio.new_event_loop()
+        self.loop.set_default_executor(self.executor)
+        self.thread = threading.Thread(target=self._run_loop,
+                                       name=f'{instrument.name}_io',
+                                       daemon=True)
+        self.thread.start()
+
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        # Serializes operations; created here so it belongs to self.loop
+        self.lock = asyncio.Lock()
+        self.loop.run_forever()
+
+
+    def _read(self, name):
+        value = getattr(self.INSTR, name)
+        if callable(value):
+            value = value()
+        return value
+
+
+    async def _get(self, name):
+        return await self.loop.run_in_executor(None, self._read, name)
+
+
+    async def _get_many(self, names):
+        results = await asyncio.gather(*[self._get(name) for name in names],
+                                       return_exceptions=True)
+        values = {}
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                print(f'{self.INSTR.name} failed to read {name}: {result}')
+            else:
+                values[name] = result
+        return values
+
+
+    async def _call(self, method, *args):
+        func = getattr(self.INSTR, method)
+        return await self.loop.run_in_executor(None, func, *args)
+
+
+    ## ------------------------------------------------------------------
+    ##  Awaitable Getters and Setters
+    ## ------------------------------------------------------------------
+    async def get(self, name):
+        """
+        Read ``name`` from the instrument.  If ``name`` is a method (e.g.
+        ``get_obstype``) it is called with no arguments, otherwise the
+        attribute (e.g. ``itime``) is returned.
+        """
+        async with self.lock:
+            return await self._get(name)
+
+
+    async def get_many(self, names):
+        """
+        Read all of ``names`` concurrently and return a dict mapping each
+        name to its value.  Names which fail to read are reported and left
+        out of the dict.
+        """
+        async with self.lock:
+            return await self._get_many(names)
+
+
+    async def call(self, method, *args):
+        """
+        Call the instrument method ``method`` with ``args``.
+        """
+        async with self.lock:
+            return await self._call(method, *args)
+
+
+    async def call_now(self, method, *args):
+        """
+        Call ``method`` with ``args`` without waiting for operations which
+        are queued or in progress.  Intended for aborts, which must be
+        able to interrupt a running sequence.
+        """
+        return await self._call(method, *args)
+
+
+    async def set(self, name, value):
+        """
+        Set ``name`` using the instrument's ``set_<name>`` method.
+        """
+        return await self.call(f'set_{name}', value)
+
+
+    async def call_and_get(self, method, *args, names=()):
+        """
+        Call ``method`` with ``args``, then read back ``names``
+        concurrently before any other operation runs.  Returns a dict as
+        for ``get_many``.
+        """
+        async with self.lock:
+            await self._call(method, *args)
+            return await self._get_many(names)
+
+
+    async def assign_and_get(self, name, value, names=()):
+        """
+        Assign ``value`` to the instrument attribute ``name`` (e.g.
+        ``script``), then read back ``names`` as for ``call_and_get``.
+        """
+        async with self.lock:
+            await self.loop.run_in_executor(None, setattr, self.INSTR,
+                                            name, value)
+            return await self._get_many(names)
+
+
+    ## ------------------------------------------------------------------
+    ##  Thread Safe Entry Points
+    ## ------------------------------------------------------------------
+    def submit(self, coro, callback=None):
+        """
+        Schedule ``coro`` on the I/O loop from any thread and return a
+        ``concurrent.futures.Future``.  If given, ``callback`` is called
+        with the result once the coroutine succeeds.  Note that it is
+        called from the I/O thread.
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+        def done(future):
+            if future.cancelled():
+                return
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f'{self.INSTR.name} I/O failed: {e}')
+                return
+            if callback is not None:
+                callback(result)
+
+        future.add_done_callback(done)
+        return future
+
+
+    async def _cancel_all(self):
+        tasks = [task for task in asyncio.all_tasks()
+                 if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+    def stop(self):
+        """
+        Cancel any pending operations, stop the I/O loop and wait for its
+        thread to finish.  A blocking instrument call which is already
+        running is left to complete in its worker thread, so callers should
+        not stop while a long running call (e.g. ``start_sequence``) is in
+        progress.
+        """
+        asyncio.run_coroutine_threadsafe(self._cancel_all(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,74 @@
+import os.path
+import time
+from importlib import util
+
+import pytest
+
+# Load the module by path, as the package __init__ needs ginga
+path = os.path.join(os.path.dirname(__file__), '..', 'XPOSE_plugin',
+                    'instrument_io.py')
+spec = util.spec_from_file_location('instrument_io', path)
+instrument_io = util.module_from_spec(spec)
+spec.loader.exec_module(instrument_io)
+AsyncInstrument = instrument_io.AsyncInstrument
+
+
+class StubInstrument(object):
+    name = 'STUB'
+
+    def __init__(self):
+        self.itime = 1.0
+        self.coadds = 2
+        self.obstype = 'Object'
+        self.script = 'Dark'
+
+    def get_obstype(self):
+        return self.obstype
+
+    def set_itime(self, itime, delay=0):
+        time.sleep(delay)
+        self.itime = itime
+
+    def get_broken(self):
+        raise ValueError('keyword unavailable')
+
+
+@pytest.fixture
+def io():
+    io = AsyncInstrument(StubInstrument())
+    yield io
+    io.stop()
+
+
+def test_get_many(io):
+    values = io.submit(io.get_many(['itime', 'coadds', 'get_obstype'])).result()
+    assert values == {'itime': 1.0, 'coadds': 2, 'get_obstype': 'Object'}
+
+
+def test_call_and_get_reads_back_after_write(io):
+    values = io.submit(io.call_and_get('set_itime', 5.0, 0.1,
+                                       names=['itime'])).result()
+    assert values == {'itime': 5.0}
+
+
+def test_writes_are_applied_in_order(io):
+    # The first write is the slowest, so it would finish last if unordered
+    futures = [io.submit(io.call('set_itime', 5.0, 0.2)),
+               io.submit(io.call('set_itime', 6.0, 0.1)),
+               io.submit(io.set('itime', 7.0))]
+    for future in futures:
+        future.result()
+    assert io.INSTR.itime == 7.0
+
+
+def test_failed_read_keeps_other_values(io):
+    values = io.submit(io.get_many(['itime', 'get_broken',
+                                    'get_obstype'])).result()
+    assert values == {'itime': 1.0, 'get_obstype': 'Object'}
+
+
+def test_assign_and_get(io):
+    values = io.submit(io.assign_and_get('script', 'Object',
+                                         names=['script'])).result()
+    assert values == {'script': 'Object'}
+    assert io.INSTR.script == 'Object'